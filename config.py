@@ -3,6 +3,10 @@
 Loads and validates TOML configuration files.
 """
 
+import copy
+import functools
+import json
+import os
 import sys
 from dataclasses import dataclass, field, fields
 from pathlib import Path
@@ -19,6 +23,14 @@ else:
         )
 
 
+# Slotted dataclasses (no per-instance __dict__, faster attribute
+# access) need Python 3.10+; older interpreters get plain dataclasses.
+# Not frozen: CLI overrides and the GUI assign fields after loading.
+_DATACLASS_OPTIONS: Dict[str, Any] = (
+    {'slots': True} if sys.version_info >= (3, 10) else {}
+)
+
+
 class ConfigError(ValueError):
     """Raised for invalid or unknown configuration."""
 
@@ -35,7 +47,7 @@ VALID_OUTPUT_FORMATS = ("m4a", "mp4")
 VALID_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PathsConfig:
     """Path configuration."""
     input_dir: Path
@@ -51,7 +63,7 @@ class PathsConfig:
             self.work_dir = Path(self.work_dir).expanduser().resolve()
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class EncodingConfig:
     """Encoding configuration."""
     vbr_quality: int = 5
@@ -71,7 +83,7 @@ class EncodingConfig:
             raise ValueError("encode_timeout must be > 0 (seconds)")
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CoverFileConfig:
     """Standalone cover file configuration."""
     enabled: bool = True
@@ -91,14 +103,14 @@ class CoverFileConfig:
             )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class MetadataConfig:
     """Metadata configuration."""
     copy_artwork: bool = True
     cover_file: CoverFileConfig = field(default_factory=CoverFileConfig)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LoudnessConfig:
     """Loudness tagging configuration."""
     enable_replaygain: bool = True
@@ -118,12 +130,17 @@ class LoudnessConfig:
             )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ProcessingConfig:
     """Processing configuration."""
     workers: int = 4
     overwrite_existing: bool = False
     log_level: str = "INFO"
+    # When True, each input directory's listing is remembered in the
+    # user cache dir together with the directory's mtime, and reused on
+    # the next run if the mtime is unchanged. Speeds up re-runs over
+    # large or network-mounted libraries; off by default.
+    scan_cache: bool = False
 
     def __post_init__(self):
         if self.workers < 1:
@@ -135,7 +152,7 @@ class ProcessingConfig:
         self.log_level = self.log_level.upper()
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Config:
     """Main configuration object."""
     paths: PathsConfig
@@ -145,6 +162,60 @@ class Config:
     processing: ProcessingConfig
 
 
+def user_cache_dir() -> Path:
+    """Return the per-user cache directory for flac2aac.
+
+    ``$XDG_CACHE_HOME`` wins on every platform when set; otherwise the
+    platform convention is used (``%LOCALAPPDATA%`` on Windows,
+    ``~/Library/Caches`` on macOS, ``~/.cache`` elsewhere). The
+    directory is not created here.
+    """
+    base = os.environ.get('XDG_CACHE_HOME')
+    if not base:
+        if sys.platform == 'win32':
+            base = os.environ.get('LOCALAPPDATA') or str(Path.home() / 'AppData' / 'Local')
+        elif sys.platform == 'darwin':
+            base = str(Path.home() / 'Library' / 'Caches')
+        else:
+            base = str(Path.home() / '.cache')
+    return Path(base) / 'flac2aac'
+
+
+def read_cache_json(name: str) -> Any:
+    """Load ``name`` from :func:`user_cache_dir`.
+
+    Returns:
+        The decoded JSON value, or None if the file is missing,
+        unreadable or not valid JSON.
+    """
+    try:
+        with open(user_cache_dir() / name, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache_json(name: str, data: Any) -> None:
+    """Atomically replace ``name`` in :func:`user_cache_dir` with ``data``.
+
+    Raises:
+        OSError: If the cache directory or file cannot be written.
+    """
+    path = user_cache_dir() / name
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
 def _build_section(
     section: str,
     data: Dict[str, Any],
@@ -164,6 +235,17 @@ def _build_section(
         raise ConfigError(f"[{section}] {e}") from e
 
 
+@functools.lru_cache(maxsize=8)
+def _read_toml(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a TOML file, memoised on its path, mtime and size.
+
+    Including the stat fields in the key means an edited file is parsed
+    again on the next load. Parse errors propagate and are not cached.
+    """
+    with open(path, 'rb') as f:
+        return tomllib.load(f)
+
+
 def load_config(config_path: Path) -> Config:
     """Load and validate configuration from TOML file.
 
@@ -177,11 +259,16 @@ def load_config(config_path: Path) -> Config:
         FileNotFoundError: If config file doesn't exist
         ConfigError: If configuration is invalid or contains unknown keys
     """
-    if not config_path.exists():
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
-    with open(config_path, 'rb') as f:
-        data = tomllib.load(f)
+    # The cached dict is shared between calls; copy it so nothing built
+    # from it (e.g. the cover search_names list) aliases another Config.
+    data = copy.deepcopy(
+        _read_toml(str(config_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    )
 
     if 'paths' not in data:
         raise ConfigError("Missing required section: [paths]")
@@ -3,17 +3,94 @@
 Handles FLAC to AAC conversion at VBR quality 5.
 """
 
+import functools
 import logging
+import os
 import re
 import shlex
+import shutil
 import subprocess
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Tuple
 
-from config import Config
+from config import Config, read_cache_json, user_cache_dir, write_cache_json
 
 logger = logging.getLogger(__name__)
 
+# Only the last lines of ffmpeg's stderr are kept for error messages;
+# the error itself is always at the end.
+_STDERR_TAIL_LINES = 64
+
+# How long to wait for the stderr reader after killing a timed-out
+# ffmpeg. A child of ffmpeg (or of a wrapper script) can keep the pipe
+# open after the kill; encode_timeout must still be honoured then.
+_READER_JOIN_TIMEOUT = 5.0
+
+# Global options for every encode: no progress line, no banner, and
+# only errors on stderr.
+_QUIET_ARGS = ('-nostats', '-loglevel', 'error')
+
+
+# ffmpeg -encoders prints lines like:
+#   " A....D libfdk_aac           Fraunhofer FDK AAC (codec aac)"
+# The encoder name sits in the second column after the flags.
+_FDK_ENCODER_RE = re.compile(r'^\s*[A-Z.]+\s+libfdk_aac\b', re.MULTILINE)
+
+
+# Binaries already known to have libfdk_aac, persisted across runs as
+# {"<path>:<mtime_ns>:<size>": true}. Only positive results are stored
+# so installing libfdk_aac is picked up on the next run.
+_CAPS_CACHE_FILE = 'ffmpeg_caps.json'
+
+
+def _load_caps_cache() -> Dict[str, bool]:
+    """Return the on-disk capability cache, or {} if absent or unreadable."""
+    data = read_cache_json(_CAPS_CACHE_FILE)
+    return data if isinstance(data, dict) else {}
+
+
+def _store_caps_cache(key: str) -> None:
+    """Record ``key`` as libfdk_aac-capable; failures are only logged."""
+    caps = _load_caps_cache()
+    caps[key] = True
+    try:
+        write_cache_json(_CAPS_CACHE_FILE, caps)
+    except OSError as e:
+        logger.debug(
+            f"Could not write ffmpeg capability cache in {user_cache_dir()}: {e}"
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_ffmpeg(binary: str, mtime_ns: int, size: int) -> bool:
+    """Return True if the ffmpeg at ``binary`` has libfdk_aac.
+
+    Memoised in-process and on disk on the binary's path, mtime and
+    size, so a replaced ffmpeg is probed again. Subprocess errors
+    propagate and are never cached.
+    """
+    key = f"{binary}:{mtime_ns}:{size}"
+    if _load_caps_cache().get(key) is True:
+        return True
+    has_fdk = _run_encoders_probe(binary)
+    if has_fdk:
+        _store_caps_cache(key)
+    return has_fdk
+
+
+def _run_encoders_probe(binary: str) -> bool:
+    """Return True if ``binary -encoders`` lists libfdk_aac."""
+    result = subprocess.run(
+        [binary, '-hide_banner', '-encoders'],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=10,
+    )
+    return _FDK_ENCODER_RE.search(result.stdout) is not None
+
 
 class EncodingError(Exception):
     """Exception raised when encoding fails."""
@@ -33,6 +110,29 @@ class Encoder:
         self.ffmpeg_bin = config.paths.ffmpeg_bin
         self.vbr_quality = config.encoding.vbr_quality
         self.encode_timeout = config.encoding.encode_timeout
+        # Everything but the file names is fixed for the encoder's
+        # lifetime, so the argv is assembled once and spliced per track.
+        self._argv_prefix, self._argv_suffix = self.build_static_argv()
+
+    def build_static_argv(self) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Return the constant parts of the single-file ffmpeg command.
+
+        :meth:`encode` runs ``[*prefix, source, *suffix, destination]``.
+
+        Returns:
+            ``(prefix, suffix)`` tuples of arguments.
+        """
+        prefix = (self.ffmpeg_bin, *_QUIET_ARGS, '-i')
+        suffix = (
+            # -vn: Skip video/image streams; embedded cover art is
+            # handled by metadata.py
+            '-vn',
+            '-c:a', 'libfdk_aac',
+            '-profile:a', 'aac_low',  # Ensures VBR compatibility
+            '-vbr', str(self.vbr_quality),
+            '-y',  # Overwrite output file
+        )
+        return prefix, suffix
     
     def encode(self, source: Path, destination: Path) -> None:
         """Encode FLAC file to AAC.
@@ -47,33 +147,13 @@ class Encoder:
         # Create output directory if needed
         destination.parent.mkdir(parents=True, exist_ok=True)
         
-        # Build FFmpeg command
-        # -vn: Skip video streams (embedded cover art will be handled by metadata.py)
-        # -profile:a aac_low: Ensures VBR compatibility
-        cmd = [
-            self.ffmpeg_bin,
-            '-i', str(source),
-            '-vn',  # Ignore video/image streams (cover art)
-            '-c:a', 'libfdk_aac',
-            '-profile:a', 'aac_low',
-            '-vbr', str(self.vbr_quality),
-            '-y',  # Overwrite output file
-            str(destination)
-        ]
+        cmd = [*self._argv_prefix, str(source), *self._argv_suffix, str(destination)]
         
         logger.debug(f"Encoding: {source.name} -> {destination.name}")
         logger.debug(f"Command: {shlex.join(cmd)}")
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=self.encode_timeout,
-            )
-            logger.info(f"Encoded: {source.name}")
-
+            returncode, stderr_tail = self._run_ffmpeg(cmd, self.encode_timeout)
         except subprocess.TimeoutExpired as e:
             # Remove any partial output ffmpeg may have left behind.
             try:
@@ -85,15 +165,62 @@ class Encoder:
             )
             logger.error(error_msg)
             raise EncodingError(error_msg) from e
-        except subprocess.CalledProcessError as e:
-            error_msg = f"Failed to encode {source.name}: {e.stderr}"
-            logger.error(error_msg)
-            raise EncodingError(error_msg) from e
         except FileNotFoundError:
             error_msg = f"FFmpeg binary not found: {self.ffmpeg_bin}"
             logger.error(error_msg)
             raise EncodingError(error_msg)
-    
+
+        if returncode != 0:
+            error_msg = f"Failed to encode {source.name}: {stderr_tail}"
+            logger.error(error_msg)
+            raise EncodingError(error_msg)
+        logger.info(f"Encoded: {source.name}")
+
+    @staticmethod
+    def _run_ffmpeg(cmd: List[str], timeout: float) -> Tuple[int, str]:
+        """Run ffmpeg and return ``(returncode, stderr_tail)``.
+
+        stderr is drained line by line on a helper thread into a
+        bounded buffer, so a chatty encode can neither fill the pipe
+        nor hold megabytes of log text in memory; only the last
+        ``_STDERR_TAIL_LINES`` lines are kept.
+
+        After a timeout the reader is given at most
+        ``_READER_JOIN_TIMEOUT`` seconds to see EOF; if another process
+        still holds the pipe, the daemon reader is abandoned rather than
+        delaying the error.
+
+        Raises:
+            subprocess.TimeoutExpired: After killing ffmpeg on timeout.
+            FileNotFoundError: If the ffmpeg binary does not exist.
+        """
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace',
+        )
+        tail: deque = deque(maxlen=_STDERR_TAIL_LINES)
+        reader = threading.Thread(target=tail.extend, args=(proc.stderr,), daemon=True)
+        reader.start()
+        join_timeout = None
+        try:
+            returncode = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            join_timeout = _READER_JOIN_TIMEOUT
+            raise
+        finally:
+            reader.join(join_timeout)
+            # Closing while the reader is still blocked in read() would
+            # wait on the same lock; leave the pipe to the daemon thread.
+            if not reader.is_alive():
+                proc.stderr.close()
+        return returncode, ''.join(tail).strip()
+
     def verify_ffmpeg(self) -> bool:
         """Verify FFmpeg is available with libfdk_aac support.
 
@@ -102,29 +229,32 @@ class Encoder:
         (e.g. in another encoder's description) cannot produce a false
         positive.
 
+        Probe results, positive or negative, are cached in-process keyed
+        on the resolved binary's path, mtime and size, so replacing the
+        binary triggers a fresh probe. Only positive results are also
+        written to the user cache directory, letting later runs skip the
+        subprocess while a missing encoder is re-checked every run.
+
         Returns:
             True if FFmpeg with libfdk_aac is available.
         """
+        binary = shutil.which(self.ffmpeg_bin)
         try:
-            result = subprocess.run(
-                [self.ffmpeg_bin, '-encoders'],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=10,
-            )
+            if binary is None:
+                # Not resolvable on PATH: probe uncached so the usual
+                # not-found handling below reports it.
+                has_fdk = _run_encoders_probe(self.ffmpeg_bin)
+            else:
+                stat = os.stat(binary)
+                has_fdk = _probe_ffmpeg(binary, stat.st_mtime_ns, stat.st_size)
         except subprocess.TimeoutExpired:
             logger.error(f"FFmpeg check timed out: {self.ffmpeg_bin}")
             return False
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        except (subprocess.CalledProcessError, OSError):
             logger.error(f"FFmpeg not found at: {self.ffmpeg_bin}")
             return False
 
-        # ffmpeg -encoders prints lines like:
-        #   " A....D libfdk_aac           Fraunhofer FDK AAC (codec aac)"
-        # The encoder name sits in the second column after the flags.
-        pattern = re.compile(r'^\s*[A-Z.]+\s+libfdk_aac\b', re.MULTILINE)
-        if pattern.search(result.stdout):
+        if has_fdk:
             return True
 
         logger.error(
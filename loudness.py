@@ -4,7 +4,11 @@ Handles ReplayGain 2.0 (EBU R128) and iTunes SoundCheck tag generation.
 """
 
 import logging
+import math
+import os
+import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Iterable, Optional, Tuple
 
@@ -18,12 +22,19 @@ except ImportError:
     )
 
 from config import Config
+from metadata import save_mp4
 
 logger = logging.getLogger(__name__)
 
 # ReplayGain 2.0 / EBU R128 reference level that rsgain always targets.
 _RG2_REFERENCE_LUFS = -18.0
 
+# Slots 5-10 of iTunNORM: the fixed values iTunes itself writes.
+_ITUNNORM_FILLER = " 00024CA8 00024CA8 00007FFF 00007FFF 00024CA8 00024CA8"
+
+# Leading signed decimal of a ReplayGain value such as b"-7.23 dB".
+_GAIN_RE = re.compile(rb'\s*([+-]?(?:\d+(?:\.\d*)?|\.\d+))')
+
 
 class LoudnessProcessor:
     """Handles loudness analysis and tag writing."""
@@ -37,6 +48,11 @@ class LoudnessProcessor:
         self.config = config
         self.loudness_config = config.loudness
         self.reference = self.loudness_config.reference_loudness
+        # Parsed MP4s from the post-rsgain verification, keyed by path and
+        # tagged with the mtime they were read at, so the soundcheck pass
+        # can reuse them instead of parsing each file a second time.
+        # Scoped to one process_album() call to bound memory.
+        self._parsed: Dict[Path, Tuple[int, MP4]] = {}
     
     def process_album(
         self,
@@ -54,15 +70,31 @@ class LoudnessProcessor:
             return
 
         logger.info(f"Processing loudness for {len(m4a_files)} track(s)")
+        try:
+            self._process_album(m4a_files, source_pairs)
+        finally:
+            self._parsed.clear()
+
+    def _process_album(
+        self,
+        m4a_files: List[Path],
+        source_pairs: Optional[List[Tuple[Path, Path]]],
+    ) -> None:
 
+        soundcheck = self.loudness_config.enable_itunes_soundcheck
         if self.loudness_config.enable_replaygain:
             reused = False
             if self.loudness_config.reuse_existing_replaygain and source_pairs:
-                reused = self._reuse_source_replaygain(source_pairs)
+                reused = self._reuse_source_replaygain(
+                    source_pairs, with_soundcheck=soundcheck
+                )
             if not reused:
                 self._add_replaygain_tags(m4a_files)
+            else:
+                # iTunNORM went out in the same save as the reused tags.
+                soundcheck = False
 
-        if self.loudness_config.enable_itunes_soundcheck:
+        if soundcheck:
             self._add_itunes_soundcheck(m4a_files)
     
     # Atom keys where rsgain (and r128gain before it) writes the track gain.
@@ -148,7 +180,9 @@ class LoudnessProcessor:
     }
 
     def _reuse_source_replaygain(
-        self, pairs: Iterable[Tuple[Path, Path]]
+        self,
+        pairs: Iterable[Tuple[Path, Path]],
+        with_soundcheck: bool = False,
     ) -> bool:
         """Copy pre-computed ReplayGain tags from each source FLAC.
 
@@ -156,6 +190,10 @@ class LoudnessProcessor:
         ``replaygain_track_gain`` value — partial coverage falls back
         to a full rsgain pass for predictability.
 
+        With ``with_soundcheck`` the iTunNORM atom is derived from the
+        copied track gain and written in the same ``save()``, so each
+        M4A is rewritten once instead of twice.
+
         Returns:
             True when RG tags were reused for the whole album, False
             when the caller should fall back to rsgain.
@@ -187,7 +225,15 @@ class LoudnessProcessor:
                 m4a = MP4(dest)
                 for atom, value in tags.items():
                     m4a[atom] = [MP4FreeForm(value.encode('utf-8'))]
-                m4a.save()
+                soundchecked = False
+                if with_soundcheck:
+                    rg_gain = self._get_replaygain_value(
+                        m4a, self._SOURCE_REPLAYGAIN_ATOMS['replaygain_track_gain']
+                    )
+                    soundchecked = self._set_soundcheck(m4a, dest, rg_gain)
+                save_mp4(m4a, dest)
+                if soundchecked:
+                    self._log_soundcheck_added(dest, rg_gain)
             except (MutagenError, OSError) as e:
                 logger.error(
                     f"Failed to copy ReplayGain tags to {dest.name}: {e}"
@@ -199,10 +245,37 @@ class LoudnessProcessor:
         )
         return True
 
+    def _open_mp4(self, m4a_file: Path, keep: bool = False) -> MP4:
+        """Return a parsed MP4, reusing one cached for this album if fresh.
+
+        A cached object is only handed out when the file's mtime still
+        matches the one it was parsed at; anything that rewrote the file
+        in between forces a re-read.
+
+        Args:
+            m4a_file: M4A file to open.
+            keep: Cache the result for a later pass. Callers that are
+                about to modify and save the object leave this False,
+                which also takes any cached entry out of the cache.
+
+        Raises:
+            MutagenError: If the file cannot be parsed.
+            OSError: If the file cannot be read.
+        """
+        mtime_ns = os.stat(m4a_file).st_mtime_ns
+        cached = self._parsed.pop(m4a_file, None)
+        if cached is not None and cached[0] == mtime_ns:
+            m4a = cached[1]
+        else:
+            m4a = MP4(m4a_file)
+        if keep:
+            self._parsed[m4a_file] = (mtime_ns, m4a)
+        return m4a
+
     def _has_replaygain(self, m4a_file: Path) -> bool:
         """Return True if the M4A file has a ReplayGain track-gain tag."""
         try:
-            m4a = MP4(m4a_file)
+            m4a = self._open_mp4(m4a_file, keep=True)
         except (MutagenError, OSError) as e:
             logger.warning(f"Could not read {m4a_file.name} to verify tags: {e}")
             return False
@@ -210,41 +283,71 @@ class LoudnessProcessor:
     
     def _add_itunes_soundcheck(self, m4a_files: List[Path]) -> None:
         """Add iTunes SoundCheck (iTunNORM) tags.
+
+        Files are independent and the work per file is mostly MP4
+        read/write I/O, so they are tagged on a thread pool sized by
+        ``[processing] workers``.
         
         Args:
             m4a_files: List of M4A files
         """
-        for m4a_file in m4a_files:
-            try:
-                m4a = MP4(m4a_file)
+        workers = min(self.config.processing.workers, len(m4a_files))
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            # Drain the iterator so every file is processed before return;
+            # per-file errors are logged inside the helper.
+            for _ in executor.map(self._add_itunes_soundcheck_one, m4a_files):
+                pass
+
+    def _add_itunes_soundcheck_one(self, m4a_file: Path) -> None:
+        """Read the track gain from one M4A and write its iTunNORM tag."""
+        try:
+            m4a = self._open_mp4(m4a_file)
 
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Available keys in {m4a_file.name}: {list(m4a.keys())}")
 
-                rg_gain = None
-                for key in self._REPLAYGAIN_KEYS:
-                    if key in m4a:
-                        rg_gain = self._get_replaygain_value(m4a, key)
-                        if rg_gain is not None:
-                            logger.debug(f"Found ReplayGain at key '{key}': {rg_gain} dB")
-                            break
-
-                if rg_gain is None:
-                    logger.warning(
-                        f"No ReplayGain data found for {m4a_file.name}, "
-                        "skipping iTunNORM"
-                    )
-                    continue
+            rg_gain = None
+            for key in self._REPLAYGAIN_KEYS:
+                if key in m4a:
+                    rg_gain = self._get_replaygain_value(m4a, key)
+                    if rg_gain is not None:
+                        logger.debug(f"Found ReplayGain at key '{key}': {rg_gain} dB")
+                        break
 
-                itunnorm = self._replaygain_to_soundcheck(
-                    rg_gain, self.loudness_config.reference_loudness
-                )
-                itunnorm_key = '----:com.apple.iTunes:iTunNORM'
-                m4a[itunnorm_key] = [MP4FreeForm(itunnorm.encode('utf-8'))]
-                m4a.save()
-                logger.info(f"Added iTunNORM to {m4a_file.name} (gain: {rg_gain} dB)")
+            if self._set_soundcheck(m4a, m4a_file, rg_gain):
+                save_mp4(m4a, m4a_file)
+                self._log_soundcheck_added(m4a_file, rg_gain)
 
-            except (MutagenError, OSError) as e:
-                logger.error(f"Failed to add iTunNORM to {m4a_file.name}: {e}")
+        except (MutagenError, OSError) as e:
+            logger.error(f"Failed to add iTunNORM to {m4a_file.name}: {e}")
+
+    def _set_soundcheck(
+        self, m4a: MP4, m4a_file: Path, rg_gain: Optional[float]
+    ) -> bool:
+        """Set the iTunNORM atom on an in-memory MP4 from a track gain.
+
+        Does not save; callers log via :meth:`_log_soundcheck_added`
+        once the save has succeeded. Returns False (and warns) when
+        ``rg_gain`` is None.
+        """
+        if rg_gain is None:
+            logger.warning(
+                f"No ReplayGain data found for {m4a_file.name}, "
+                "skipping iTunNORM"
+            )
+            return False
+
+        itunnorm = self._replaygain_to_soundcheck(
+            rg_gain, self.loudness_config.reference_loudness
+        )
+        itunnorm_key = '----:com.apple.iTunes:iTunNORM'
+        m4a[itunnorm_key] = [MP4FreeForm(itunnorm.encode('ascii'))]
+        return True
+
+    @staticmethod
+    def _log_soundcheck_added(m4a_file: Path, rg_gain: float) -> None:
+        """Report an iTunNORM tag that has been written to disk."""
+        logger.info(f"Added iTunNORM to {m4a_file.name} (gain: {rg_gain} dB)")
     
     def _get_replaygain_value(self, m4a: MP4, key: str) -> Optional[float]:
         """Extract ReplayGain value from M4A freeform tags.
@@ -262,26 +365,22 @@ class LoudnessProcessor:
             return None
         
         try:
-            # rsgain stores values as MP4FreeForm bytes
+            # rsgain stores values as MP4FreeForm, a bytes subclass, so
+            # the regex can run on it directly without a copy.
             value = m4a[key][0]
-            
-            # MP4FreeForm objects store data as bytes
-            if isinstance(value, MP4FreeForm):
-                value_bytes = bytes(value)
-            elif isinstance(value, bytes):
+            if isinstance(value, (bytes, bytearray)):
                 value_bytes = value
             else:
                 value_bytes = str(value).encode('utf-8')
             
-            # Decode to string
-            value_str = value_bytes.decode('utf-8').strip()
-            
-            # Parse "+X.XX dB" or "-X.XX dB" format
-            # rsgain format example: "-7.23 dB"
-            gain_str = value_str.replace(' dB', '').replace('dB', '').strip()
-            return float(gain_str)
+            # Parse "+X.XX dB" or "-X.XX dB" format straight from the
+            # bytes; rsgain format example: "-7.23 dB"
+            match = _GAIN_RE.match(value_bytes)
+            if match is None:
+                raise ValueError(f"no gain value in {value_bytes!r}")
+            return float(match.group(1))
         
-        except (ValueError, IndexError, AttributeError, UnicodeDecodeError) as e:
+        except (ValueError, IndexError, AttributeError) as e:
             logger.warning(f"Failed to parse ReplayGain value from {key}: {e}")
             return None
     
@@ -315,11 +414,12 @@ class LoudnessProcessor:
         # Shift the effective gain to hit reference_loudness instead of
         # the hardwired -18 LUFS that rsgain always tags against.
         adjusted_gain = gain_db + (reference_loudness - _RG2_REFERENCE_LUFS)
-        ratio = 10 ** (-adjusted_gain / 10.0)
-        sc_1000 = max(0, min(int(round(ratio * 1000)), 0xFFFFFFFE))
-        sc_2500 = max(0, min(int(round(ratio * 2500)), 0xFFFFFFFE))
+        # ratio is always positive, so only the upper clamp can bite;
+        # round() of a float already returns an int.
+        ratio = math.pow(10.0, -adjusted_gain / 10.0)
+        sc_1000 = min(round(ratio * 1000), 0xFFFFFFFE)
+        sc_2500 = min(round(ratio * 2500), 0xFFFFFFFE)
         return (
-            f" {sc_1000:08X} {sc_1000:08X}"
-            f" {sc_2500:08X} {sc_2500:08X}"
-            f" 00024CA8 00024CA8 00007FFF 00007FFF 00024CA8 00024CA8"
+            f" {sc_1000:08X} {sc_1000:08X} {sc_2500:08X} {sc_2500:08X}"
+            f"{_ITUNNORM_FILLER}"
         )
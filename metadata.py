@@ -5,9 +5,12 @@ Handles tag mapping, cover art extraction and embedding.
 
 import io
 import logging
+import os
 import shutil
+import sys
+import tempfile
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 try:
     from mutagen import MutagenError
@@ -18,6 +21,11 @@ except ImportError:
         "mutagen package required. Install with: pip install mutagen"
     )
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 try:
     from PIL import Image
 except ImportError:
@@ -88,6 +96,65 @@ TAG_FREEFORM_MAPPING = [
 
 _TRUTHY = {'1', 'true', 'yes', 'on'}
 
+# Vorbis keys whose value is a ``number[/total]`` pair (MP4 tuple atoms).
+_NUMBER_PAIR_KEYS = frozenset({'tracknumber', 'discnumber'})
+
+# Write buffer for tag saves. Mutagen rewrites MP4 atoms with many small
+# reads/writes; a large userspace buffer coalesces them into a handful
+# of syscalls, which matters on ZFS and network filesystems.
+_SAVE_BUFFER_SIZE = 1 << 20
+
+
+# Linux FICLONE ioctl, _IOW(0x94, 9, int). Python 3.12+ exposes it as
+# fcntl.FICLONE; older versions need the raw request number.
+_FICLONE = (
+    getattr(fcntl, 'FICLONE', 0x40049409)
+    if fcntl is not None and sys.platform.startswith('linux')
+    else None
+)
+
+
+def _clone_or_copy(source: Path, dest: Path) -> None:
+    """Copy ``source`` to ``dest``, preserving timestamps like copy2.
+
+    Tries a reflink first: on btrfs, XFS and ZFS 2.2+ the clone shares
+    extents with the source, so no data is copied. Anywhere else this falls
+    back to ``shutil.copy2`` (which itself copies in-kernel on Linux).
+
+    The clone is made in a temporary file next to ``dest`` and renamed
+    into place, so a failed clone never truncates an existing ``dest``.
+
+    Raises:
+        shutil.SameFileError: If ``source`` and ``dest`` are the same file
+            (checked before anything is opened, as copy2 does).
+    """
+    if os.path.exists(dest) and os.path.samefile(source, dest):
+        raise shutil.SameFileError(f"{source} and {dest} are the same file")
+    if _FICLONE is not None:
+        fd, tmp = tempfile.mkstemp(
+            dir=os.path.dirname(dest) or '.', prefix=f".{os.path.basename(dest)}.",
+            suffix='.tmp',
+        )
+        try:
+            with open(source, 'rb') as src, open(fd, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            shutil.copystat(source, tmp)
+            os.replace(tmp, dest)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+        else:
+            return
+    shutil.copy2(source, dest)
+
+
+def save_mp4(m4a: MP4, path: Path) -> None:
+    """Save ``m4a`` to ``path`` through a 1 MiB buffered file handle."""
+    with open(path, 'r+b', buffering=_SAVE_BUFFER_SIZE) as f:
+        m4a.save(f)
+
 
 class MetadataHandler:
     """Handles metadata transfer between FLAC and M4A."""
@@ -115,7 +182,7 @@ class MetadataHandler:
             if self.config.metadata.copy_artwork:
                 self._copy_cover_art(flac, m4a)
 
-            m4a.save()
+            save_mp4(m4a, destination)
             logger.debug(f"Copied metadata: {source.name} -> {destination.name}")
 
         except (MutagenError, OSError) as e:
@@ -143,17 +210,18 @@ class MetadataHandler:
           MusicBrainz IDs, ISRC, label, catalog, barcode, ...)
         """
         written: set = set()
+        tags = self._index_vorbis_tags(flac)
 
         for vorbis_key, mp4_key in TAG_MAPPING:
             if mp4_key in written:
                 # Earlier mapping already populated this atom (e.g.
                 # ``date`` before ``year``). Don't clobber it.
                 continue
-            values = flac.get(vorbis_key, [])
+            values = tags.get(vorbis_key)
             if not values:
                 continue
 
-            if vorbis_key in ('tracknumber', 'discnumber'):
+            if vorbis_key in _NUMBER_PAIR_KEYS:
                 try:
                     parts = str(values[0]).split('/')
                     track_num = int(parts[0])
@@ -161,7 +229,7 @@ class MetadataHandler:
                         total = int(parts[1])
                     else:
                         total = self._lookup_total(
-                            flac, self._TOTAL_FALLBACK_KEYS[vorbis_key]
+                            tags, self._TOTAL_FALLBACK_KEYS[vorbis_key]
                         )
                     m4a[mp4_key] = [(track_num, total)]
                 except (ValueError, IndexError):
@@ -173,7 +241,7 @@ class MetadataHandler:
             written.add(mp4_key)
 
         for vorbis_key, mp4_key in TAG_INTEGER_MAPPING:
-            values = flac.get(vorbis_key, [])
+            values = tags.get(vorbis_key)
             if not values:
                 continue
             try:
@@ -182,13 +250,13 @@ class MetadataHandler:
                 logger.warning(f"Invalid {vorbis_key} format: {values[0]}")
 
         for vorbis_key, mp4_key in TAG_BOOL_MAPPING:
-            values = flac.get(vorbis_key, [])
+            values = tags.get(vorbis_key)
             if not values:
                 continue
             m4a[mp4_key] = str(values[0]).strip().lower() in _TRUTHY
 
         for vorbis_key, atom_name in TAG_FREEFORM_MAPPING:
-            values = flac.get(vorbis_key, [])
+            values = tags.get(vorbis_key)
             if not values:
                 continue
             atom = f'----:com.apple.iTunes:{atom_name}'
@@ -197,11 +265,24 @@ class MetadataHandler:
             ]
 
     @staticmethod
-    def _lookup_total(flac: FLAC, keys: tuple) -> int:
+    def _index_vorbis_tags(flac: FLAC) -> Dict[str, List[str]]:
+        """Group the FLAC's Vorbis comments by lower-cased key.
+
+        ``flac.get(key)`` scans every comment on each call, and the
+        mapping tables probe ~40 keys per file; one pass here turns each
+        of those probes into a dict lookup.
+        """
+        tags: Dict[str, List[str]] = {}
+        for key, value in flac.tags or ():
+            tags.setdefault(key.lower(), []).append(value)
+        return tags
+
+    @staticmethod
+    def _lookup_total(tags: Dict[str, List[str]], keys: tuple) -> int:
         """Return the first parseable integer found under any of ``keys``,
         or ``0`` when none is available."""
         for key in keys:
-            values = flac.get(key, [])
+            values = tags.get(key)
             if not values:
                 continue
             try:
@@ -221,28 +302,20 @@ class MetadataHandler:
             logger.debug("No embedded cover art found")
             return
         
-        # Find front cover (type 3) or use first picture
-        cover = None
-        for pic in flac.pictures:
-            if pic.type == 3:  # Front cover
-                cover = pic
-                break
-        
-        if not cover and flac.pictures:
-            cover = flac.pictures[0]
+        # Front cover (type 3), else the first picture
+        cover = next((p for p in flac.pictures if p.type == 3), flac.pictures[0])
+
+        # Determine format
+        if cover.mime == 'image/jpeg':
+            image_format = MP4Cover.FORMAT_JPEG
+        elif cover.mime == 'image/png':
+            image_format = MP4Cover.FORMAT_PNG
+        else:
+            logger.warning(f"Unsupported cover format: {cover.mime}")
+            return
         
-        if cover:
-            # Determine format
-            if cover.mime == 'image/jpeg':
-                image_format = MP4Cover.FORMAT_JPEG
-            elif cover.mime == 'image/png':
-                image_format = MP4Cover.FORMAT_PNG
-            else:
-                logger.warning(f"Unsupported cover format: {cover.mime}")
-                return
-            
-            m4a['covr'] = [MP4Cover(cover.data, imageformat=image_format)]
-            logger.debug(f"Copied cover art ({cover.mime})")
+        m4a['covr'] = [MP4Cover(cover.data, imageformat=image_format)]
+        logger.debug(f"Copied cover art ({cover.mime})")
 
 
 class CoverManager:
@@ -293,12 +366,24 @@ class CoverManager:
         Returns:
             Path to cover file if found
         """
+        # One directory listing instead of a stat() per candidate name.
+        try:
+            with os.scandir(directory) as it:
+                present = {entry.name for entry in it if entry.is_file()}
+        except OSError:
+            return None
+
+        # Each search name matches exactly or, failing that, ignoring
+        # case, so COVER.JPG is still found for "cover.jpg" just as
+        # exists() finds it on a case-insensitive filesystem.
+        folded = {name.casefold(): name for name in sorted(present)}
         for filename in self.cover_config.search_names:
-            cover_path = directory / filename
-            if cover_path.exists():
+            name = filename if filename in present else folded.get(filename.casefold())
+            if name is not None:
+                cover_path = directory / name
                 logger.debug(f"Found cover file: {cover_path.name}")
                 return cover_path
-        
+
         return None
     
     def _extract_cover_from_flac(
@@ -315,15 +400,23 @@ class CoverManager:
         Returns:
             dest_path on success, None on failure or if no cover is embedded.
         """
-        flac_files = [
-            p for p in source_dir.iterdir()
-            if p.is_file() and p.suffix.lower() == ".flac"
-        ]
-        if not flac_files:
+        # scandir's cached d_type answers is_file() without a stat() per
+        # entry, and we only need the first match.
+        try:
+            with os.scandir(source_dir) as it:
+                first_flac = next(
+                    (Path(entry.path) for entry in it
+                     if entry.name.lower().endswith(".flac") and entry.is_file()),
+                    None,
+                )
+        except OSError as e:
+            logger.warning(f"Failed to list {source_dir} for cover extraction: {e}")
+            return None
+        if first_flac is None:
             return None
 
         try:
-            flac = FLAC(flac_files[0])
+            flac = FLAC(first_flac)
         except MutagenError as e:
             logger.warning(f"Failed to read FLAC for cover extraction: {e}")
             return None
@@ -350,7 +443,7 @@ class CoverManager:
             logger.warning(f"Failed to write extracted cover to {dest_path}: {e}")
             return None
 
-        logger.debug(f"Extracted cover from {flac_files[0].name} -> {dest_path.name}")
+        logger.debug(f"Extracted cover from {first_flac.name} -> {dest_path.name}")
         return dest_path
     
     def _copy_cover_file(self, source: Path, dest_dir: Path) -> None:
@@ -373,7 +466,7 @@ class CoverManager:
         if Image and self._needs_processing(source):
             self._process_and_save(source, dest_path)
         else:
-            shutil.copy2(source, dest_path)
+            _clone_or_copy(source, dest_path)
 
         logger.info(f"Copied cover: {dest_path.name}")
 
@@ -406,19 +499,24 @@ class CoverManager:
         """
         try:
             with Image.open(source) as img:
+                # Palette images would be resampled NEAREST; expand first.
+                if img.mode == 'P':
+                    img = img.convert('RGBA')
+
+                # Resize before flattening so the composite below runs at
+                # the target size. On a not-yet-decoded JPEG, thumbnail()
+                # also lets libjpeg decode at 1/2, 1/4 or 1/8 scale.
+                max_size = self.cover_config.max_size
+                if max_size > 0:
+                    img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
                 # Flatten transparency onto white before JPEG conversion.
-                if img.mode in ('RGBA', 'LA', 'P'):
+                if img.mode in ('RGBA', 'LA'):
                     rgba = img.convert('RGBA')
                     background = Image.new('RGB', rgba.size, (255, 255, 255))
                     background.paste(rgba, mask=rgba.split()[3])
                     img = background
 
-                if self.cover_config.max_size > 0:
-                    img.thumbnail(
-                        (self.cover_config.max_size, self.cover_config.max_size),
-                        Image.Resampling.LANCZOS
-                    )
-
                 img.save(
                     dest,
                     'JPEG',
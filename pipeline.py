@@ -6,12 +6,12 @@ finished albums are moved to output_dir in a single operation, minimising
 writes to the final storage device (ideal for RAM disk workflows).
 """
 
+import itertools
 import logging
 import os
 import shutil
 import threading
-from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, List, Dict, Optional, Tuple
@@ -182,28 +182,32 @@ class Pipeline:
         # the whole library pass — log the error, count it, and move
         # on. The per-album cleanup inside _process_album already
         # takes care of work_dir state.
+        # One pool for the whole run: its worker threads are reused
+        # across albums instead of being spawned and joined per album.
         files_done = 0
-        for album_index, (album_dir, files) in enumerate(album_groups.items()):
-            if self.cancel_event and self.cancel_event.is_set():
-                logger.info("Conversion cancelled by user.")
-                break
-            logger.info(f"\nProcessing album: {album_dir}")
-            try:
-                files_done = self._process_album(
-                    files,
-                    album_index=album_index,
-                    album_total=album_total,
-                    files_done=files_done,
-                )
-            except Exception as exc:
-                logger.error(f"  Album failed, continuing: {album_dir}: {exc}")
-                self.stats.albums_failed += 1
-                # Even on failure, advance the counter so the bar keeps
-                # moving right — the user still wants to see overall
-                # progress through the library.
-                files_done += len(files)
-                continue
-            self.stats.albums_processed += 1
+        with ThreadPoolExecutor(max_workers=self.config.processing.workers) as executor:
+            for album_index, (album_dir, files) in enumerate(album_groups.items()):
+                if self.cancel_event and self.cancel_event.is_set():
+                    logger.info("Conversion cancelled by user.")
+                    break
+                logger.info(f"\nProcessing album: {album_dir}")
+                try:
+                    files_done = self._process_album(
+                        files,
+                        album_index=album_index,
+                        album_total=album_total,
+                        files_done=files_done,
+                        executor=executor,
+                    )
+                except Exception as exc:
+                    logger.error(f"  Album failed, continuing: {album_dir}: {exc}")
+                    self.stats.albums_failed += 1
+                    # Even on failure, advance the counter so the bar keeps
+                    # moving right — the user still wants to see overall
+                    # progress through the library.
+                    files_done += len(files)
+                    continue
+                self.stats.albums_processed += 1
 
         return self.stats
 
@@ -227,11 +231,21 @@ class Pipeline:
     def _group_by_album(
         self, file_pairs: List[Tuple[Path, Path]]
     ) -> Dict[Path, List[Tuple[Path, Path]]]:
-        """Group file pairs by source album directory."""
-        groups: Dict[Path, List[Tuple[Path, Path]]] = defaultdict(list)
-        for source, dest in file_pairs:
-            groups[source.parent].append((source, dest))
-        return dict(groups)
+        """Group file pairs by source album directory.
+
+        Albums come back ordered by directory path; tracks keep their
+        scan order within an album (the sort is stable). Keys are
+        compared as strings so no intermediate Path is built per file.
+        """
+        def album_key(pair: Tuple[Path, Path]) -> str:
+            return os.path.dirname(str(pair[0]))
+
+        return {
+            Path(album_dir): list(pairs)
+            for album_dir, pairs in itertools.groupby(
+                sorted(file_pairs, key=album_key), key=album_key
+            )
+        }
 
     def _process_album(
         self,
@@ -239,13 +253,16 @@ class Pipeline:
         album_index: int = 0,
         album_total: int = 0,
         files_done: int = 0,
+        executor: Optional[ThreadPoolExecutor] = None,
     ) -> int:
         """Process all files in one album.
 
         When work_dir is enabled:
           1. Create a temporary album sub-directory inside work_dir.
           2. Encode + tag every track there (parallel).
-          3. Copy cover art into the work directory.
+          3. Copy cover art into the work directory (alongside step 2,
+             from the first successful track on, when ``executor`` is
+             given).
           4. Run loudness analysis + iTunNORM on the work copies.
           5. Move the finished album directory to output_dir.
           6. Clean up any leftover temp directory.
@@ -253,13 +270,16 @@ class Pipeline:
         When work_dir is disabled the same steps run directly in
         output_dir (original behaviour).
 
+        ``executor`` is the run-wide encode pool; when omitted a pool
+        is created for this album alone.
+
         Returns:
             Updated ``files_done`` count after this album has been
             processed (or attempted), used by the caller to keep the
             progress bar monotonic.
         """
         source_album_dir = file_pairs[0][0].parent
-        final_album_dir = file_pairs[0][1].parent
+        final_album_dir = self.scanner.get_dest_album_dir(source_album_dir)
         track_total = len(file_pairs)
 
         if self.use_work_dir:
@@ -268,6 +288,18 @@ class Pipeline:
         else:
             work_album_dir = final_album_dir
 
+        # The cover does not depend on the encoded audio, so it runs on
+        # the pool while the remaining tracks encode. It is only started
+        # once a track has succeeded: an album where nothing encodes must
+        # not leave a cover behind in an otherwise empty directory.
+        cover_futures: List[Future] = []
+
+        def start_cover() -> None:
+            logger.info("  Processing cover art...")
+            cover_futures.append(executor.submit(
+                self.cover_manager.handle_cover_file, source_album_dir, work_album_dir
+            ))
+
         try:
             # Phase 1 & 2: Encode + copy metadata (parallel).
             # _encode_album emits its own per-track progress events;
@@ -281,6 +313,8 @@ class Pipeline:
                 album_total=album_total,
                 track_total=track_total,
                 files_done=files_done,
+                executor=executor,
+                on_first_success=start_cover if executor is not None else None,
             )
 
             if not encoded_pairs:
@@ -291,8 +325,11 @@ class Pipeline:
             files_done += len(encoded_pairs)
 
             # Phase 3: Cover art
-            logger.info("  Processing cover art...")
-            self.cover_manager.handle_cover_file(source_album_dir, work_album_dir)
+            if cover_futures:
+                cover_futures[0].result()
+            else:
+                logger.info("  Processing cover art...")
+                self.cover_manager.handle_cover_file(source_album_dir, work_album_dir)
 
             # Phase 4 & 5: Loudness analysis + iTunNORM. The bar holds
             # at the post-encode value here — the user just sees a
@@ -327,6 +364,9 @@ class Pipeline:
             return files_done
 
         except Exception:
+            # Never delete the directory under a cover copy still running.
+            for cover_future in cover_futures:
+                cover_future.exception()
             # On failure clean up the work directory so no half-finished
             # files are left behind on the RAM disk.
             if self.use_work_dir and work_album_dir.exists():
@@ -343,6 +383,8 @@ class Pipeline:
         album_total: int = 0,
         track_total: int = 0,
         files_done: int = 0,
+        executor: Optional[ThreadPoolExecutor] = None,
+        on_first_success: Optional[Callable[[], None]] = None,
     ) -> List[Tuple[Path, Path]]:
         """Encode all tracks for one album into work_album_dir.
 
@@ -355,27 +397,60 @@ class Pipeline:
         track (success or failure) so the GUI can advance its bar in
         real time. ``files_done`` is incremented in lockstep with the
         GUI's monotonic counter.
+
+        ``on_first_success`` is called once, on the calling thread, as
+        soon as the first track has encoded successfully.
         """
+        if executor is None:
+            with ThreadPoolExecutor(
+                max_workers=self.config.processing.workers
+            ) as own_executor:
+                return self._encode_album(
+                    file_pairs,
+                    source_album_dir,
+                    work_album_dir,
+                    album_index=album_index,
+                    album_total=album_total,
+                    track_total=track_total,
+                    files_done=files_done,
+                    executor=own_executor,
+                    on_first_success=on_first_success,
+                )
+
         work_file_pairs: List[Tuple[Path, Path]] = []
         for source, final_dest in file_pairs:
             relative = source.with_suffix(f".{self.config.encoding.output_format}").name
             work_dest = work_album_dir / relative
             work_file_pairs.append((source, work_dest))
 
+        # Longest job first: a big hi-res track submitted last would
+        # otherwise run alone at the end while the other workers idle.
+        # File size is a good proxy for encode time.
+        work_file_pairs.sort(key=self._source_size, reverse=True)
+
         encoded_pairs: List[Tuple[Path, Path]] = []
         track_done = 0
 
-        with ThreadPoolExecutor(max_workers=self.config.processing.workers) as executor:
-            futures = {
-                executor.submit(self._encode_file, src, dst): (src, dst)
-                for src, dst in work_file_pairs
-            }
-            for future in as_completed(futures):
-                src, dst = futures[future]
+        # Keep at most two jobs per worker queued: enough that a worker
+        # never idles waiting for the next submit, without holding a
+        # Future per track for very large albums.
+        max_in_flight = 2 * self.config.processing.workers
+        pending = iter(work_file_pairs)
+        in_flight: Dict[Future, Tuple[Path, Path]] = {}
+        while True:
+            for src, dst in itertools.islice(pending, max_in_flight - len(in_flight)):
+                in_flight[executor.submit(self._encode_file, src, dst)] = (src, dst)
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                src, dst = in_flight.pop(future)
                 try:
                     if future.result():
                         encoded_pairs.append((src, dst))
                         self.stats.successful += 1
+                        if on_first_success is not None and len(encoded_pairs) == 1:
+                            on_first_success()
                     else:
                         self.stats.failed += 1
                 except Exception as exc:
@@ -394,6 +469,14 @@ class Pipeline:
 
         return encoded_pairs
 
+    @staticmethod
+    def _source_size(pair: Tuple[Path, Path]) -> int:
+        """Return the size of a pair's source file, or 0 if it can't be stat'ed."""
+        try:
+            return os.stat(pair[0]).st_size
+        except OSError:
+            return 0
+
     def _encode_file(self, source: Path, dest: Path) -> bool:
         """Encode a single file and copy its metadata.
 
@@ -496,13 +579,15 @@ class Pipeline:
             logger.debug(f"  Could not remove work dir (not empty): {work_album_dir}")
 
     def _print_dry_run_report(self, file_pairs: List[Tuple[Path, Path]]) -> None:
-        """Print dry-run report."""
-        logger.info("\n" + "=" * 60)
-        logger.info("DRY RUN - Files to be processed:")
-        logger.info("=" * 60)
+        """Print dry-run report.
+
+        Built as one string and logged once: a library-sized listing
+        as thousands of separate records is dominated by logging
+        overhead.
+        """
+        rule = "=" * 60
+        lines = ["\n" + rule, "DRY RUN - Files to be processed:", rule]
         for source, dest in file_pairs:
-            logger.info(f"  {source}")
-            logger.info(f"  -> {dest}\n")
-        logger.info("=" * 60)
-        logger.info(f"Total: {len(file_pairs)} file(s)")
-        logger.info("=" * 60)
+            lines.append(f"  {source}\n  -> {dest}\n")
+        lines += [rule, f"Total: {len(file_pairs)} file(s)", rule]
+        logger.info("\n".join(lines))
@@ -4,13 +4,30 @@ Scans input directory for FLAC files and generates output paths.
 """
 
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterator, List, Set, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
-from config import Config
+from config import Config, read_cache_json, user_cache_dir, write_cache_json
 
 logger = logging.getLogger(__name__)
 
+# Directories listed concurrently while scanning. readdir is I/O-bound,
+# so this is independent of [processing] workers.
+_SCAN_WORKERS = 8
+
+# Directory listings persisted across runs when [processing] scan_cache
+# is enabled: {"version": 1, "roots": {input_dir: {dir: [mtime_ns,
+# [[flac_path, dedup_key], ...], [subdir, ...]]}}}.
+_SCAN_CACHE_FILE = "scan_cache.json"
+_SCAN_CACHE_VERSION = 1
+
+# Filesystem timestamps can be coarse (2 s on FAT); directories changed
+# this recently are not cached.
+_RACY_WINDOW_NS = 2_000_000_000
+
 
 class Scanner:
     """Discovers FLAC files and maps them to output paths."""
@@ -26,6 +43,15 @@ class Scanner:
         self.output_dir = config.paths.output_dir
         self.output_ext = f".{config.encoding.output_format}"
         self.skipped = 0
+        # Destination paths are derived with string operations; a Path
+        # is only built for the pairs that are actually yielded.
+        # Both prefixes end in a separator, so a destination is one slice
+        # and one concatenation.
+        self._input_prefix_len = len(os.path.join(str(self.input_dir), ""))
+        self._output_prefix = os.path.join(str(self.output_dir), "")
+        # Names present in each destination directory, listed once per
+        # directory instead of stat'ing every candidate output.
+        self._dest_listing_cache: Dict[str, Set[str]] = {}
     
     def scan(self) -> Iterator[Tuple[Path, Path]]:
         """Recursively scan for FLAC files.
@@ -43,48 +69,217 @@ class Scanner:
         
         logger.info(f"Scanning for FLAC files in: {self.input_dir}")
 
-        # Case-insensitive walk, deduplicated by resolved path so that
-        # case-insensitive filesystems (macOS default, Windows) don't
-        # yield the same file twice.
-        seen: Set[Path] = set()
-        flac_files: List[Path] = []
-        for path in self.input_dir.rglob("*"):
-            if not path.is_file() or path.suffix.lower() != ".flac":
-                continue
-            resolved = path.resolve()
-            if resolved in seen:
-                continue
-            seen.add(resolved)
-            flac_files.append(path)
+        flac_files = self._walk_flac(str(self.input_dir))
 
         logger.info(f"Found {len(flac_files)} FLAC file(s)")
         self.skipped = 0
+        self._dest_listing_cache.clear()
+        overwrite = self.config.processing.overwrite_existing
 
         for source_path in flac_files:
             dest_path = self._get_destination_path(source_path)
 
             # Skip if exists and overwrite disabled
-            if dest_path.exists() and not self.config.processing.overwrite_existing:
+            if not overwrite and self._dest_exists(dest_path):
                 logger.debug(f"Skipping existing file: {dest_path}")
                 self.skipped += 1
                 continue
 
-            yield source_path, dest_path
+            yield Path(source_path), Path(dest_path)
     
-    def _get_destination_path(self, source_path: Path) -> Path:
+    def _dest_exists(self, dest_path: str) -> bool:
+        """Return True if ``dest_path`` exists, via a per-directory listing."""
+        parent, name = os.path.split(dest_path)
+        names = self._dest_listing_cache.get(parent)
+        if names is None:
+            try:
+                names = set(os.listdir(parent))
+            except (FileNotFoundError, NotADirectoryError):
+                names = set()
+            self._dest_listing_cache[parent] = names
+        return name in names
+
+    def _walk_flac(self, root: str) -> List[str]:
+        """Return paths of FLAC files under ``root`` using os.scandir.
+
+        The tree is walked breadth-first; every directory of a level is
+        listed on a small thread pool so that readdir latency (network
+        shares, spinning disks) overlaps. Results are merged in listing
+        order, so the output is deterministic.
+
+        Matching is case-insensitive on the extension. Directory symlinks
+        are not followed (as with ``Path.rglob``). File symlinks are
+        resolved and deduplicated against their target, so an alias such
+        as ``song.FLAC -> song.flac`` is yielded once; plain entries need
+        no ``realpath`` because ``root`` is already resolved.
+
+        With ``[processing] scan_cache`` enabled, a directory whose mtime
+        matches the previous run's is not listed again; its cached
+        listing is used instead.
+        """
+        use_cache = self.config.processing.scan_cache
+        cached = self._load_scan_cache(root) if use_cache else None
+        listings: Dict[str, list] = {}
+        scan_start_ns = time.time_ns()
+
+        def list_dir(directory: str) -> Tuple[Optional[int], list, list]:
+            return self._list_dir(directory, cached)
+
+        seen: Set[str] = set()
+        found: List[str] = []
+        level = [root]
+        with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as executor:
+            while level:
+                next_level: List[str] = []
+                results = executor.map(list_dir, level)
+                for directory, (mtime_ns, candidates, subdirs) in zip(level, results):
+                    if mtime_ns is not None:
+                        listings[directory] = [mtime_ns, candidates, subdirs]
+                    for path, key in candidates:
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        found.append(path)
+                    next_level.extend(subdirs)
+                level = next_level
+
+        if use_cache:
+            self._save_scan_cache(root, listings, scan_start_ns)
+        return found
+
+    @staticmethod
+    def _list_dir(
+        directory: str,
+        cached: Optional[Dict[str, list]] = None,
+    ) -> Tuple[Optional[int], list, list]:
+        """List one directory for :meth:`_walk_flac`.
+
+        Args:
+            directory: Directory to list
+            cached: Previous listings keyed by directory, or None when the
+                scan cache is disabled (the directory is then not stat'ed)
+
+        Returns:
+            ``(mtime_ns, [(flac_path, dedup_key), ...], [subdirectory, ...])``.
+            ``mtime_ns`` is None when the cache is disabled or the
+            directory cannot be read; the lists are empty in the latter case.
+        """
+        mtime_ns: Optional[int] = None
+        if cached is not None:
+            try:
+                # Taken before listing, so a change made while we list
+                # shows up as a newer mtime next run.
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError as e:
+                logger.warning(f"Cannot read directory {directory}: {e}")
+                return None, [], []
+            entry = cached.get(directory)
+            if Scanner._is_valid_listing(entry) and entry[0] == mtime_ns:
+                return mtime_ns, entry[1], entry[2]
+
+        candidates: List[Tuple[str, str]] = []
+        subdirs: List[str] = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    if not entry.name.lower().endswith(".flac") or not entry.is_file():
+                        continue
+                    key = (
+                        os.path.realpath(entry.path)
+                        if entry.is_symlink() else entry.path
+                    )
+                    candidates.append((entry.path, key))
+        except OSError as e:
+            logger.warning(f"Cannot read directory {directory}: {e}")
+            return None, [], []
+        return mtime_ns, candidates, subdirs
+
+    @staticmethod
+    def _is_valid_listing(entry: object) -> bool:
+        """Return True if ``entry`` has the shape :meth:`_list_dir` stores.
+
+        The cache file is only an optimisation and may be stale, edited
+        or truncated; anything unexpected is treated as a cache miss.
+        """
+        if not (isinstance(entry, list) and len(entry) == 3):
+            return False
+        mtime_ns, candidates, subdirs = entry
+        return (
+            isinstance(mtime_ns, int) and not isinstance(mtime_ns, bool)
+            and isinstance(candidates, list)
+            and all(
+                isinstance(c, list) and len(c) == 2
+                and isinstance(c[0], str) and isinstance(c[1], str)
+                for c in candidates
+            )
+            and isinstance(subdirs, list)
+            and all(isinstance(d, str) for d in subdirs)
+        )
+
+    @staticmethod
+    def _read_scan_cache() -> Dict[str, Any]:
+        """Return the scan cache file's contents, or a fresh empty cache."""
+        data = read_cache_json(_SCAN_CACHE_FILE)
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != _SCAN_CACHE_VERSION
+            or not isinstance(data.get("roots"), dict)
+        ):
+            return {"version": _SCAN_CACHE_VERSION, "roots": {}}
+        return data
+
+    @staticmethod
+    def _load_scan_cache(root: str) -> Dict[str, list]:
+        """Return the cached listings for ``root``, or {} if there are none."""
+        listings = Scanner._read_scan_cache()["roots"].get(root)
+        return listings if isinstance(listings, dict) else {}
+
+    @staticmethod
+    def _save_scan_cache(
+        root: str, listings: Dict[str, list], scan_start_ns: int
+    ) -> None:
+        """Persist ``listings`` for ``root``, keeping other roots' entries.
+
+        Directories modified within :data:`_RACY_WINDOW_NS` of the scan
+        are left out: a later change in the same mtime tick would
+        otherwise be indistinguishable from the cached state.
+        """
+        cutoff = scan_start_ns - _RACY_WINDOW_NS
+        stable = {d: v for d, v in listings.items() if v[0] < cutoff}
+        data = Scanner._read_scan_cache()
+        data["roots"][root] = stable
+        try:
+            write_cache_json(_SCAN_CACHE_FILE, data)
+        except OSError as e:
+            logger.debug(f"Could not write scan cache in {user_cache_dir()}: {e}")
+
+    def get_dest_album_dir(self, source_album_dir: Path) -> Path:
+        """Return the output directory mirroring a source album directory.
+
+        Args:
+            source_album_dir: Directory under ``input_dir``
+
+        Returns:
+            Matching directory under ``output_dir``
+        """
+        return self.output_dir / source_album_dir.relative_to(self.input_dir)
+
+    def _get_destination_path(self, source_path: str) -> str:
         """Generate output path mirroring input structure.
         
         Args:
-            source_path: Input FLAC file path
+            source_path: Input FLAC file path, as returned by
+                :meth:`_walk_flac` (always under ``input_dir``)
             
         Returns:
             Output M4A file path
         """
-        # Get relative path from input root
-        relative_path = source_path.relative_to(self.input_dir)
-        
-        # Replace extension
-        output_relative = relative_path.with_suffix(self.output_ext)
+        # Relative path from input root, minus the extension (the walk
+        # only returns names ending in .flac, any case)
+        relative_stem = source_path[self._input_prefix_len:-len(".flac")]
         
         # Construct full output path
-        return self.output_dir / output_relative
+        return self._output_prefix + relative_stem + self.output_ext
@@ -169,3 +169,23 @@ def test_reuse_existing_replaygain_is_opt_in(tmp_path):
     """)
     config = load_config(cfg_path)
     assert config.loudness.reuse_existing_replaygain is True
+
+
+def test_reload_picks_up_edits_and_returns_independent_objects(tmp_path):
+    body = """
+        [paths]
+        input_dir = "/tmp/in"
+        output_dir = "/tmp/out"
+
+        [encoding]
+        vbr_quality = {q}
+    """
+    cfg_path = _write_config(tmp_path, body.format(q=5))
+    first = load_config(cfg_path)
+    second = load_config(cfg_path)
+    assert first is not second
+    first.metadata.cover_file.search_names.append("mutated.jpg")
+    assert "mutated.jpg" not in second.metadata.cover_file.search_names
+
+    _write_config(tmp_path, body.format(q=3) + "\n# edited\n")
+    assert load_config(cfg_path).encoding.vbr_quality == 3
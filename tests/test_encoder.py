@@ -1,6 +1,8 @@
-"""Tests for Encoder: verify_ffmpeg timeout and missing-binary handling."""
+"""Tests for Encoder: verify_ffmpeg timeout and missing-binary handling,
+and the argv / stderr-tail behaviour of encode()."""
 
 import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import patch
 
@@ -15,7 +17,18 @@ from config import (
     PathsConfig,
     ProcessingConfig,
 )
-from encoder import Encoder
+import encoder
+from encoder import Encoder, EncodingError
+
+
+@pytest.fixture(autouse=True)
+def _clear_ffmpeg_probe_cache(tmp_path, monkeypatch):
+    # verify_ffmpeg memoises per binary in-process and on disk; keep
+    # tests independent of each other and of the user's cache.
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    encoder._probe_ffmpeg.cache_clear()
+    yield
+    encoder._probe_ffmpeg.cache_clear()
 
 
 def _make_encoder(tmp_path: Path, ffmpeg_bin: str = "ffmpeg") -> Encoder:
@@ -61,3 +74,102 @@ def test_verify_ffmpeg_passes_timeout_to_subprocess(tmp_path):
         enc.verify_ffmpeg()
 
     assert captured.get("timeout") == 10
+
+
+def _fake_ffmpeg(tmp_path: Path, body: str) -> str:
+    """Write an executable shell script that stands in for ffmpeg."""
+    script = tmp_path / "fake-ffmpeg"
+    script.write_text("#!/bin/sh\n" + body)
+    script.chmod(0o755)
+    return str(script)
+
+
+posix_only = pytest.mark.skipif(sys.platform == "win32", reason="needs /bin/sh")
+
+
+@posix_only
+def test_encode_error_carries_only_stderr_tail(tmp_path):
+    """A failing encode reports the last lines of stderr, not all of it."""
+    enc = _make_encoder(tmp_path, _fake_ffmpeg(
+        tmp_path, 'i=0\nwhile [ $i -lt 500 ]; do echo "noise $i" >&2; i=$((i+1)); done\n'
+                  'echo "Invalid data found" >&2\nexit 1\n'
+    ))
+
+    with pytest.raises(EncodingError) as excinfo:
+        enc.encode(tmp_path / "a.flac", tmp_path / "out" / "a.m4a")
+
+    message = str(excinfo.value)
+    assert message.endswith("Invalid data found")
+    assert "noise 499" in message
+    assert "noise 0\n" not in message
+
+
+@posix_only
+def test_verify_ffmpeg_probes_each_binary_once(tmp_path):
+    calls = tmp_path / "calls"
+    enc = _make_encoder(tmp_path, _fake_ffmpeg(
+        tmp_path, f'echo x >> "{calls}"\necho " A....D libfdk_aac  Fraunhofer FDK AAC"\n'
+    ))
+
+    assert enc.verify_ffmpeg() is True
+    assert enc.verify_ffmpeg() is True
+    assert len(calls.read_text().splitlines()) == 1
+
+
+@posix_only
+def test_verify_ffmpeg_reuses_on_disk_result_across_processes(tmp_path):
+    calls = tmp_path / "calls"
+    enc = _make_encoder(tmp_path, _fake_ffmpeg(
+        tmp_path, f'echo x >> "{calls}"\necho " A....D libfdk_aac  Fraunhofer FDK AAC"\n'
+    ))
+    assert enc.verify_ffmpeg() is True
+    # A new process starts with an empty in-memory cache.
+    encoder._probe_ffmpeg.cache_clear()
+    assert enc.verify_ffmpeg() is True
+    assert len(calls.read_text().splitlines()) == 1
+    assert (tmp_path / "cache" / "flac2aac" / "ffmpeg_caps.json").is_file()
+
+
+@posix_only
+def test_verify_ffmpeg_does_not_persist_negative_result(tmp_path):
+    calls = tmp_path / "calls"
+    enc = _make_encoder(tmp_path, _fake_ffmpeg(
+        tmp_path, f'echo x >> "{calls}"\necho " A....D aac  native AAC"\n'
+    ))
+    assert enc.verify_ffmpeg() is False
+    encoder._probe_ffmpeg.cache_clear()
+    assert enc.verify_ffmpeg() is False
+    assert len(calls.read_text().splitlines()) == 2
+
+
+@posix_only
+def test_encode_splices_paths_into_prebuilt_argv(tmp_path):
+    argv_log = tmp_path / "argv"
+    enc = _make_encoder(
+        tmp_path, _fake_ffmpeg(tmp_path, f'printf "%s\\n" "$@" > "{argv_log}"\n')
+    )
+    prefix, suffix = enc.build_static_argv()
+    src, dst = tmp_path / "a.flac", tmp_path / "out" / "a.m4a"
+    enc.encode(src, dst)
+
+    assert argv_log.read_text().splitlines() == [*prefix[1:], str(src), *suffix, str(dst)]
+    assert prefix[-1] == "-i"
+    assert suffix[0] == "-vn" and suffix[-1] == "-y"
+
+
+@posix_only
+def test_encode_timeout_holds_when_a_child_keeps_stderr_open(tmp_path):
+    """Killing ffmpeg must be enough: a grandchild still holding the
+    stderr pipe must not stretch encode_timeout."""
+    import time
+
+    enc = _make_encoder(tmp_path, _fake_ffmpeg(tmp_path, "sleep 30\n"))
+    enc.encode_timeout = 1
+    dest = tmp_path / "out" / "a.m4a"
+
+    started = time.monotonic()
+    with pytest.raises(EncodingError, match="timed out"):
+        enc.encode(tmp_path / "a.flac", dest)
+
+    assert time.monotonic() - started < 1 + encoder._READER_JOIN_TIMEOUT + 2
+    assert not dest.exists()
@@ -1,8 +1,8 @@
-"""Tests for the iTunNORM conversion in LoudnessProcessor.
+"""Tests for the iTunNORM conversion and ReplayGain parsing in LoudnessProcessor.
 
-We avoid instantiating a full ``Config`` here; the conversion is a
-pure method on ``LoudnessProcessor`` and only touches ``self`` for
-method resolution.
+We avoid instantiating a full ``Config`` here; the conversion and the
+RG value parser are pure methods on ``LoudnessProcessor`` and only touch
+``self`` for method resolution.
 """
 
 import re
@@ -17,6 +17,7 @@ def processor():
     # Bind the unbound method manually — no Config needed.
     class _Shim:
         _replaygain_to_soundcheck = LoudnessProcessor._replaygain_to_soundcheck
+        _get_replaygain_value = LoudnessProcessor._get_replaygain_value
     return _Shim()
 
 
@@ -114,3 +115,24 @@ def test_reference_loudness_minus18_matches_legacy(processor):
     parts = _split(out)
     assert parts[0] == parts[1] == "0000F678"
     assert parts[2] == parts[3] == "0002682B"
+
+
+# ── ReplayGain value parsing ────────────────────────────────────────────────
+
+@pytest.mark.parametrize("raw, expected", [
+    (b"-7.23 dB", -7.23),
+    (b"+1.50 dB", 1.5),
+    (b"  -0.5dB", -0.5),
+    (b"3 dB", 3.0),
+])
+def test_get_replaygain_value_parses_rsgain_formats(processor, raw, expected):
+    from mutagen.mp4 import MP4FreeForm
+
+    key = "----:com.apple.iTunes:REPLAYGAIN_TRACK_GAIN"
+    value = processor._get_replaygain_value({key: [MP4FreeForm(raw)]}, key)
+    assert value == pytest.approx(expected)
+
+
+def test_get_replaygain_value_rejects_garbage(processor):
+    key = "----:com.apple.iTunes:REPLAYGAIN_TRACK_GAIN"
+    assert processor._get_replaygain_value({key: [b"n/a"]}, key) is None
@@ -1,4 +1,5 @@
-"""Tests for rsgain integration in LoudnessProcessor."""
+"""Tests for rsgain integration in LoudnessProcessor and the
+reuse_existing_replaygain fast path."""
 
 import subprocess
 from pathlib import Path
@@ -114,3 +115,105 @@ def test_rsgain_failure_is_logged_not_raised(tmp_path):
     ):
         # Should not raise; error is logged and the method returns early.
         proc._add_replaygain_tags([tmp_path / "a.m4a"])
+
+
+# ── reuse_existing_replaygain fast path ──────────────────────────────────────
+
+class _FakeMP4(dict):
+    """Dict-backed MP4 stand-in that counts saves per path."""
+    saves: dict = {}
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def save(self, filething=None):
+        _FakeMP4.saves[self.path] = _FakeMP4.saves.get(self.path, 0) + 1
+
+
+def test_reused_replaygain_writes_itunnorm_in_the_same_save(tmp_path):
+    proc = _make_processor(tmp_path)
+    proc.loudness_config.reuse_existing_replaygain = True
+    pairs = [(tmp_path / "a.flac", tmp_path / "a.m4a")]
+    pairs[0][1].write_bytes(b"")
+    source_tags = {"replaygain_track_gain": ["-6.00 dB"]}
+    written = {}
+
+    def fake_mp4(path):
+        written[path] = _FakeMP4(path)
+        return written[path]
+
+    _FakeMP4.saves = {}
+    with patch("loudness.FLAC", return_value=source_tags), \
+         patch("loudness.MP4", side_effect=fake_mp4), \
+         patch("subprocess.run") as rsgain:
+        proc.process_album([dest for _, dest in pairs], source_pairs=pairs)
+
+    rsgain.assert_not_called()
+    m4a = written[pairs[0][1]]
+    assert _FakeMP4.saves == {pairs[0][1]: 1}
+    assert bytes(m4a["----:com.apple.iTunes:REPLAYGAIN_TRACK_GAIN"][0]) == b"-6.00 dB"
+    assert "----:com.apple.iTunes:iTunNORM" in m4a
+
+
+def test_soundcheck_pass_tags_every_file_and_survives_failures(tmp_path):
+    proc = _make_processor(tmp_path)
+    files = [tmp_path / f"t{i}.m4a" for i in range(6)]
+    for f in files:
+        f.write_bytes(b"")
+    key = "----:com.apple.iTunes:REPLAYGAIN_TRACK_GAIN"
+    written = {}
+
+    def fake_mp4(path):
+        if path.name == "t3.m4a":
+            raise OSError("unreadable")
+        m4a = _FakeMP4(path)
+        m4a[key] = [b"-3.00 dB"]
+        written[path] = m4a
+        return m4a
+
+    _FakeMP4.saves = {}
+    with patch("loudness.MP4", side_effect=fake_mp4):
+        proc._add_itunes_soundcheck(files)
+
+    assert set(_FakeMP4.saves) == set(files) - {tmp_path / "t3.m4a"}
+    assert all("----:com.apple.iTunes:iTunNORM" in m4a for m4a in written.values())
+
+
+def test_soundcheck_reuses_mp4s_parsed_after_rsgain(tmp_path):
+    proc = _make_processor(tmp_path)
+    files = [tmp_path / f"t{i}.m4a" for i in range(3)]
+    for f in files:
+        f.write_bytes(b"")
+    opened = []
+
+    def fake_mp4(path):
+        opened.append(path)
+        m4a = _FakeMP4(path)
+        m4a["----:com.apple.iTunes:REPLAYGAIN_TRACK_GAIN"] = [b"-3.00 dB"]
+        return m4a
+
+    _FakeMP4.saves = {}
+    with patch("loudness.MP4", side_effect=fake_mp4), \
+         patch("subprocess.run", side_effect=_ok):
+        proc.process_album(files)
+
+    assert sorted(opened) == sorted(files)
+    assert set(_FakeMP4.saves) == set(files)
+    assert proc._parsed == {}
+
+
+def test_itunnorm_not_reported_when_save_fails(tmp_path, caplog):
+    proc = _make_processor(tmp_path)
+    proc.loudness_config.reuse_existing_replaygain = True
+    pairs = [(tmp_path / "a.flac", tmp_path / "a.m4a")]
+    pairs[0][1].write_bytes(b"")
+
+    with patch("loudness.FLAC", return_value={"replaygain_track_gain": ["-6.00 dB"]}), \
+         patch("loudness.MP4", side_effect=_FakeMP4), \
+         patch("loudness.save_mp4", side_effect=OSError("disk full")), \
+         caplog.at_level("INFO", logger="loudness"):
+        assert proc._reuse_source_replaygain(pairs, with_soundcheck=True) is False
+
+    assert not any("Added iTunNORM" in r.getMessage() for r in caplog.records)
+    assert any("Failed to copy ReplayGain" in r.getMessage() for r in caplog.records)
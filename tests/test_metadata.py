@@ -101,6 +101,32 @@ def test_track_combined_form_still_works(handler, tmp_path):
     assert m4a["trkn"] == [(5, 12)]
 
 
+def test_mixed_case_and_multi_value_keys_are_grouped(handler, tmp_path):
+    flac_path = tmp_path / "sample.flac"
+    _write_empty_flac(flac_path)
+    flac = FLAC(flac_path)
+    flac.add_tags()
+    flac.tags.append(("ARTIST", "First"))
+    flac.tags.append(("Artist", "Second"))
+    flac.tags.append(("TRACKNUMBER", "3"))
+    flac.tags.append(("TrackTotal", "9"))
+    flac.save()
+
+    m4a = _FakeM4A()
+    handler._copy_text_tags(FLAC(flac_path), m4a)
+    assert m4a["©ART"] == ["First", "Second"]
+    assert m4a["trkn"] == [(3, 9)]
+
+
+def test_flac_without_vorbis_comment_copies_nothing(handler, tmp_path):
+    flac_path = tmp_path / "sample.flac"
+    _write_empty_flac(flac_path)
+
+    m4a = _FakeM4A()
+    handler._copy_text_tags(FLAC(flac_path), m4a)
+    assert m4a == {}
+
+
 def test_tracktotal_fallback(handler, tmp_path):
     flac_path = tmp_path / "sample.flac"
     _write_empty_flac(flac_path)
@@ -279,6 +305,42 @@ def test_missing_extra_tags_leave_atoms_absent(handler, tmp_path):
         assert atom not in m4a
 
 
+# --------------------------------------------------------------------
+# save_mp4: buffered tag writes
+# --------------------------------------------------------------------
+
+def _atom(name: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", 8 + len(payload)) + name + payload
+
+
+def _write_minimal_m4a(path: Path) -> None:
+    """ftyp + moov(mvhd) + mdat: the least mutagen's MP4 will open."""
+    mvhd = _atom(
+        b"mvhd",
+        b"\x00\x00\x00\x00" + struct.pack(">IIII", 0, 0, 1000, 1000) + b"\x00" * 80,
+    )
+    path.write_bytes(
+        _atom(b"ftyp", b"M4A \x00\x00\x00\x00M4A mp42isom")
+        + _atom(b"moov", mvhd)
+        + _atom(b"mdat", b"\x00" * 4096)
+    )
+
+
+def test_save_mp4_round_trips_growing_tags(tmp_path):
+    from mutagen.mp4 import MP4
+    from metadata import save_mp4
+
+    path = tmp_path / "track.m4a"
+    _write_minimal_m4a(path)
+    m4a = MP4(path)
+    m4a["©nam"] = ["x" * 5000]
+    save_mp4(m4a, path)
+
+    reread = MP4(path)
+    assert reread["©nam"] == ["x" * 5000]
+    assert reread.info.length == pytest.approx(1.0)
+
+
 # --------------------------------------------------------------------
 # CoverManager: verbatim copy of conforming JPEGs, conversion of
 # non-JPEG embedded art
@@ -335,6 +397,25 @@ def test_oversized_jpeg_is_resized(cover_manager, tmp_path):
         assert max(img.size) <= 2000
 
 
+def test_oversized_transparent_png_is_resized_and_flattened(cover_manager, tmp_path):
+    import io
+    from PIL import Image as PILImage
+
+    buf = io.BytesIO()
+    PILImage.new("RGBA", (3000, 1000), (0, 0, 0, 0)).save(buf, "PNG")
+    source = tmp_path / "src" / "cover.jpg"
+    source.parent.mkdir()
+    source.write_bytes(buf.getvalue())
+    dest_dir = tmp_path / "dest"
+
+    cover_manager._copy_cover_file(source, dest_dir)
+
+    with PILImage.open(dest_dir / "cover.jpg") as img:
+        assert img.format == "JPEG"
+        assert img.size == (2000, 667)
+        assert all(channel > 250 for channel in img.getpixel((1000, 333)))
+
+
 def _write_flac_with_picture(path: Path, mime: str, data: bytes) -> None:
     from mutagen.flac import Picture
 
@@ -377,3 +458,49 @@ def test_extracted_jpeg_art_written_verbatim(cover_manager, tmp_path):
     cover_manager.handle_cover_file(source_dir, dest_dir)
 
     assert (dest_dir / "cover.jpg").read_bytes() == jpeg_data
+
+
+def test_find_cover_file_prefers_search_order_and_ignores_case(cover_manager, tmp_path):
+    # A directory named like the first search name is not a cover.
+    (tmp_path / "COVER.JPG").mkdir()
+    (tmp_path / "front.jpg").write_bytes(b"")
+    (tmp_path / "Folder.jpg").write_bytes(b"")
+
+    found = cover_manager._find_cover_file(tmp_path)
+    assert found == tmp_path / "Folder.jpg"
+
+
+def test_find_cover_file_missing_directory_returns_none(cover_manager, tmp_path):
+    assert cover_manager._find_cover_file(tmp_path / "missing") is None
+
+
+def test_clone_or_copy_preserves_bytes_and_mtime(tmp_path):
+    import os
+    from metadata import _clone_or_copy
+
+    source = tmp_path / "cover.jpg"
+    source.write_bytes(b"\xff\xd8" + b"x" * 10000)
+    os.utime(source, (1_000_000_000, 1_000_000_000))
+    dest = tmp_path / "copy.jpg"
+
+    _clone_or_copy(source, dest)
+
+    assert dest.read_bytes() == source.read_bytes()
+    assert dest.stat().st_mtime == source.stat().st_mtime
+    # No temporary clone target is left behind, whichever path ran.
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["copy.jpg", "cover.jpg"]
+
+
+def test_clone_or_copy_onto_itself_keeps_the_file(tmp_path):
+    import shutil
+    from metadata import _clone_or_copy
+
+    cover = tmp_path / "cover.jpg"
+    data = b"\xff\xd8" + b"x" * 10000
+    cover.write_bytes(data)
+
+    with pytest.raises(shutil.SameFileError):
+        _clone_or_copy(cover, tmp_path / "." / "cover.jpg")
+
+    assert cover.read_bytes() == data
+    assert [p.name for p in tmp_path.iterdir()] == ["cover.jpg"]
@@ -2,6 +2,7 @@
 and rsgain startup verification."""
 
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import patch
 
@@ -293,3 +294,130 @@ def test_progress_callback_exceptions_do_not_abort_run(tmp_path, monkeypatch):
     # Pipeline still finished cleanly.
     assert stats.successful == 1
     assert stats.failed == 0
+
+
+def test_encode_album_bounds_jobs_in_flight(tmp_path, monkeypatch):
+    """Only 2*workers encode jobs are queued at once; the rest are
+    submitted as earlier tracks finish, and every track is still done."""
+
+    pipeline = _make_pipeline(tmp_path)
+    monkeypatch.setattr(pipeline, "_encode_file", lambda src, dst: True)
+
+    outstanding = []
+    peak = [0]
+
+    class CountingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            future = super().submit(fn, *args, **kwargs)
+            outstanding.append(future)
+            peak[0] = max(peak[0], sum(not f.done() for f in outstanding))
+            return future
+
+    pairs = [(tmp_path / f"{i:02d}.flac", tmp_path / f"{i:02d}.m4a") for i in range(25)]
+    with CountingExecutor(max_workers=1) as executor:
+        encoded = pipeline._encode_album(
+            pairs, tmp_path, tmp_path / "work", track_total=25, executor=executor,
+        )
+
+    assert len(outstanding) == 25
+    assert len(encoded) == 25
+    assert peak[0] <= 2
+
+
+def test_dry_run_report_is_a_single_log_record(tmp_path, caplog):
+    pipeline = _make_pipeline(tmp_path)
+    pairs = [(tmp_path / f"{i}.flac", tmp_path / f"{i}.m4a") for i in range(3)]
+    with caplog.at_level("INFO", logger="pipeline"):
+        pipeline._print_dry_run_report(pairs)
+
+    assert len(caplog.records) == 1
+    report = caplog.records[0].getMessage()
+    for source, dest in pairs:
+        assert f"  {source}\n  -> {dest}\n" in report
+    assert "Total: 3 file(s)" in report
+
+
+def test_group_by_album_orders_albums_and_keeps_track_order(tmp_path):
+    pipeline = _make_pipeline(tmp_path)
+    b, a = tmp_path / "in" / "B", tmp_path / "in" / "A"
+    pairs = [
+        (b / "02.flac", tmp_path / "out" / "B" / "02.m4a"),
+        (a / "01.flac", tmp_path / "out" / "A" / "01.m4a"),
+        (b / "01.flac", tmp_path / "out" / "B" / "01.m4a"),
+    ]
+    groups = pipeline._group_by_album(pairs)
+
+    assert list(groups) == [a, b]
+    assert groups[b] == [pairs[0], pairs[2]]
+
+
+def test_encode_album_submits_largest_sources_first(tmp_path, monkeypatch):
+    pipeline = _make_pipeline(tmp_path)
+    order = []
+    monkeypatch.setattr(
+        pipeline, "_encode_file", lambda src, dst: order.append(src.name) or True
+    )
+    album = tmp_path / "in" / "album"
+    album.mkdir(parents=True)
+    for name, size in (("01.flac", 10), ("02.flac", 300), ("03.flac", 20)):
+        (album / name).write_bytes(b"\0" * size)
+    pairs = [
+        (album / n, tmp_path / "out" / n)
+        for n in ("01.flac", "02.flac", "03.flac", "gone.flac")
+    ]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pipeline._encode_album(pairs, album, tmp_path / "work", executor=executor)
+
+    assert order == ["02.flac", "03.flac", "01.flac", "gone.flac"]
+
+
+def test_cover_art_is_handled_while_tracks_encode(tmp_path, monkeypatch):
+    pipeline = _make_pipeline(tmp_path)
+    cover_done = threading.Event()
+    seen_by_encoder = []
+
+    def fake_encode(src, dst):
+        # The first track finishes at once; the second only returns once
+        # the cover job, started by that first success, has run.
+        if src.name == "02.flac":
+            seen_by_encoder.append(cover_done.wait(timeout=5))
+        return True
+
+    monkeypatch.setattr(pipeline, "_encode_file", fake_encode)
+    monkeypatch.setattr(
+        pipeline.cover_manager, "handle_cover_file", lambda src, dst: cover_done.set()
+    )
+    monkeypatch.setattr(pipeline.loudness_processor, "process_album", lambda *a, **k: None)
+
+    album = tmp_path / "in" / "album"
+    pairs = [
+        (album / f"{n}.flac", tmp_path / "out" / "album" / f"{n}.m4a")
+        for n in ("01", "02")
+    ]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        done = pipeline._process_album(pairs, executor=executor)
+
+    assert done == 2
+    assert seen_by_encoder == [True]
+
+
+def test_no_cover_left_behind_when_no_track_encodes(tmp_path, monkeypatch):
+    """Without work_dir the album is written straight to output_dir; if
+    every track fails there must be no album directory holding only a
+    cover."""
+    Image = pytest.importorskip("PIL.Image")
+    pipeline = _make_pipeline(tmp_path)
+    monkeypatch.setattr(pipeline, "_encode_file", lambda src, dst: False)
+
+    album = tmp_path / "in" / "album"
+    album.mkdir(parents=True)
+    Image.new("RGB", (8, 8)).save(album / "cover.jpg")
+    pairs = [
+        (album / f"{n}.flac", tmp_path / "out" / "album" / f"{n}.m4a")
+        for n in ("01", "02")
+    ]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pipeline._process_album(pairs, executor=executor)
+
+    assert not (tmp_path / "out" / "album").exists()
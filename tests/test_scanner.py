@@ -1,5 +1,8 @@
 """Tests for Scanner: case-insensitive walk, dedup, overwrite behaviour."""
 
+import json
+import os
+import time
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -21,6 +24,7 @@ def _make_config(
     input_dir: Path,
     output_dir: Path,
     overwrite: bool = False,
+    scan_cache: bool = False,
 ) -> Config:
     return Config(
         paths=PathsConfig(input_dir=input_dir, output_dir=output_dir),
@@ -28,7 +32,8 @@ def _make_config(
         metadata=MetadataConfig(cover_file=CoverFileConfig()),
         loudness=LoudnessConfig(),
         processing=ProcessingConfig(
-            workers=1, overwrite_existing=overwrite, log_level="INFO"
+            workers=1, overwrite_existing=overwrite, log_level="INFO",
+            scan_cache=scan_cache,
         ),
     )
 
@@ -151,3 +156,164 @@ def test_skipped_counter_is_zero_when_overwrite_enabled(tmp_path):
     list(scanner.scan())
 
     assert scanner.skipped == 0
+
+
+def test_walk_does_not_follow_directory_symlinks(tmp_path):
+    """Matches Path.rglob: a symlinked directory is not descended into,
+    so a library linked back into itself is not scanned twice."""
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    (input_dir / "Artist" / "Album").mkdir(parents=True)
+    (input_dir / "Artist" / "Album" / "01.flac").write_bytes(b"")
+    (input_dir / "Artist" / "Album" / "02.Flac").write_bytes(b"")
+    try:
+        (input_dir / "Link").symlink_to(input_dir / "Artist", target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("filesystem does not support symlinks")
+
+    cfg = _make_config(input_dir, output_dir)
+    names = sorted(src.name for src, _ in Scanner(cfg).scan())
+    assert names == ["01.flac", "02.Flac"]
+
+
+def test_existing_check_lists_each_destination_dir_once(tmp_path, monkeypatch):
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    for album in ("A", "B"):
+        (input_dir / album).mkdir(parents=True)
+        for n in range(3):
+            (input_dir / album / f"{n}.flac").write_bytes(b"")
+    (output_dir / "A").mkdir(parents=True)
+    (output_dir / "A" / "1.m4a").write_bytes(b"")
+
+    import scanner as scanner_module
+    listed = []
+    real_listdir = scanner_module.os.listdir
+    monkeypatch.setattr(
+        scanner_module.os, "listdir",
+        lambda p: listed.append(p) or real_listdir(p),
+    )
+
+    cfg = _make_config(input_dir, output_dir, overwrite=False)
+    scanner = Scanner(cfg)
+    pairs = list(scanner.scan())
+
+    assert len(pairs) == 5
+    assert scanner.skipped == 1
+    assert sorted(map(Path, listed)) == [output_dir / "A", output_dir / "B"]
+
+
+def test_destination_keeps_dots_in_stem_and_replaces_any_case_suffix(tmp_path):
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    (input_dir / "Vol. 1").mkdir(parents=True)
+    (input_dir / "Vol. 1" / "01. Intro.FLAC").write_bytes(b"")
+
+    cfg = _make_config(input_dir, output_dir)
+    [(src, dest)] = list(Scanner(cfg).scan())
+    assert src == input_dir / "Vol. 1" / "01. Intro.FLAC"
+    assert dest == output_dir / "Vol. 1" / "01. Intro.m4a"
+
+
+def test_walk_finds_files_at_every_depth(tmp_path):
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    expected = []
+    for artist in ("A", "B", "C"):
+        for album in ("X", "Y"):
+            disc = input_dir / artist / album / "Disc 1"
+            disc.mkdir(parents=True)
+            for track in (disc / "01.flac", disc.parent / "bonus.flac"):
+                track.write_bytes(b"")
+                expected.append(track)
+    (input_dir / "top.flac").write_bytes(b"")
+    expected.append(input_dir / "top.flac")
+
+    cfg = _make_config(input_dir, output_dir)
+    first = [src for src, _ in Scanner(cfg).scan()]
+    assert sorted(first) == sorted(expected)
+    # Directories are listed concurrently but merged in a stable order.
+    assert [src for src, _ in Scanner(cfg).scan()] == first
+
+
+def test_dest_album_dir_matches_yielded_destinations(tmp_path):
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    (input_dir / "Artist" / "Album").mkdir(parents=True)
+    (input_dir / "Artist" / "Album" / "01.flac").write_bytes(b"")
+    (input_dir / "loose.flac").write_bytes(b"")
+
+    scanner = Scanner(_make_config(input_dir, output_dir))
+    for src, dest in scanner.scan():
+        assert scanner.get_dest_album_dir(src.parent) == dest.parent
+
+
+def test_scan_cache_skips_listing_unchanged_directories(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    for album in ("A", "B"):
+        (input_dir / album).mkdir(parents=True)
+        (input_dir / album / "01.flac").write_bytes(b"")
+
+    def age(*dirs, seconds=3600):
+        # Cached listings must predate the racy-mtime window.
+        old = time.time() - seconds
+        for d in dirs:
+            os.utime(d, (old, old))
+
+    age(input_dir, input_dir / "A", input_dir / "B")
+    cfg = _make_config(input_dir, output_dir, scan_cache=True)
+    first = list(Scanner(cfg).scan())
+
+    import scanner as scanner_module
+    listed = []
+    real_scandir = scanner_module.os.scandir
+    monkeypatch.setattr(
+        scanner_module.os, "scandir",
+        lambda p: listed.append(p) or real_scandir(p),
+    )
+
+    assert list(Scanner(cfg).scan()) == first
+    assert listed == []
+
+    (input_dir / "A" / "02.flac").write_bytes(b"")
+    age(input_dir / "A", seconds=1800)
+    second = list(Scanner(cfg).scan())
+    assert listed == [str(input_dir / "A")]
+    assert len(second) == 3
+
+
+def test_scan_cache_disabled_by_default_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    (input_dir / "song.flac").write_bytes(b"")
+
+    list(Scanner(_make_config(input_dir, tmp_path / "out")).scan())
+    assert not (tmp_path / "cache").exists()
+
+
+@pytest.mark.parametrize("cache", [
+    {"version": 1, "roots": []},
+    {"version": 1, "roots": {"ROOT": []}},
+    {"version": 1, "roots": {"ROOT": {"ROOT": 5}}},
+    {"version": 1, "roots": {"ROOT": {"ROOT": [None, [], []]}}},
+    {"version": 1, "roots": {"ROOT": {"ROOT": ["MTIME", [["only-one"]], []]}}},
+    {"version": 1, "roots": {"ROOT": {"ROOT": ["MTIME", [], [7]]}}},
+    [1, 2, 3],
+])
+def test_malformed_scan_cache_is_a_miss(tmp_path, monkeypatch, cache):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    input_dir = tmp_path / "in"
+    input_dir.mkdir()
+    (input_dir / "song.flac").write_bytes(b"")
+    cache_file = tmp_path / "cache" / "flac2aac" / "scan_cache.json"
+    cache_file.parent.mkdir(parents=True)
+    mtime = os.stat(input_dir).st_mtime_ns
+    text = json.dumps(cache).replace('"ROOT"', json.dumps(str(input_dir)))
+    cache_file.write_text(text.replace('"MTIME"', str(mtime)))
+
+    cfg = _make_config(input_dir, tmp_path / "out", scan_cache=True)
+    pairs = list(Scanner(cfg).scan())
+    assert [src.name for src, _ in pairs] == ["song.flac"]